@@ -1,37 +1,98 @@
 import tkinter as tk
+import numpy as np
+from numpy.lib import recfunctions as rfn
+from bisect import bisect_left
 from tkinter import ttk, messagebox
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import Dict, List
 
+try:
+    from numba import njit
+except ImportError:  # Numba is optional; the kernel runs as plain Python without it
+    def njit(*args, **kwargs):
+        return lambda fn: fn
+
 
 # -----------------------------
 # Core Logic
 # -----------------------------
 
-@dataclass
+# Integer event opcodes used by the simulation kernel
+DEPOSIT, EXPENSE, APY_CHANGE = 0, 1, 2
+EVENT_TYPES = ("deposit", "expense", "apy_change")
+EVENT_OP = {"deposit": DEPOSIT, "expense": EXPENSE, "apy_change": APY_CHANGE}
+
+# Column names of the history table, so no account may use them
+RESERVED_NAMES = ("Month", "Total")
+
+
+@dataclass(slots=True)
 class Event:
     month: int
     type: str
     account: str
     amount: float = 0.0
     new_apy: float = 0.0
-@dataclass
+    op: int = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        self.op = EVENT_OP.get(self.type, -1)
+@dataclass(slots=True)
 class Account:
     name: str
     balance: float
     annual_return: float
+    _monthly_factor: float = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        self._monthly_factor = (1 + self.annual_return) ** (1 / 12)
+
+    def set_apy(self, annual_return):
+        self.annual_return = annual_return
+        self._monthly_factor = (1 + annual_return) ** (1 / 12)
 
     def monthly_return(self):
-        return (1 + self.annual_return) ** (1 / 12) - 1
+        return self._monthly_factor - 1
 
     def apply_growth(self):
-        self.balance *= (1 + self.monthly_return())
+        self.balance *= self._monthly_factor
+
+
+@njit(cache=True, fastmath=True)
+def _simulate(balances, factors, event_months, event_kinds, event_accts, event_vals, history):
+    # Events arrive sorted by month, so a single pointer walks them in order
+    n_events = event_months.shape[0]
+    n = balances.shape[0]  # the last history column is filled in by the caller
+
+    i = 0
+    for m in range(history.shape[0]):
+        month = m + 1
+
+        while i < n_events and event_months[i] == month:
+            a = event_accts[i]
+            kind = event_kinds[i]
 
-    def deposit(self, amount):
-        self.balance += amount
+            if kind == DEPOSIT:
+                balances[a] += event_vals[i]
+            elif kind == EXPENSE:
+                balances[a] -= event_vals[i]
+            else:
+                factors[a] = event_vals[i]  # precomputed monthly factor
+
+            i += 1
+
+        balances *= factors
+        history[m, :n] = balances
 
-    def withdraw(self, amount):
-        self.balance -= amount
+
+def _round_cents(table):
+    # np.round scales by 100 before rounding, which can tip a value sitting on
+    # a half cent the other way from round(x, 2); those few cells use round()
+    scaled = table * 100
+    near_tie = np.abs(scaled - np.floor(scaled) - 0.5) <= 4 * np.spacing(np.abs(scaled))
+    exact = [round(v, 2) for v in table[near_tie].tolist()]
+    np.round(table, 2, out=table)
+    table[near_tie] = exact
 
 
 class FinancialSimulation:
@@ -39,38 +100,87 @@ class FinancialSimulation:
         self.accounts = accounts
         self.months = months
         self.events = events
-        self.history = []
-
-    def run(self):
-        for month in range(1, self.months + 1):
 
-            # 🔹 Apply events scheduled for this month
-            for event in self.events:
-                if event.month == month:
-                    acc = self.accounts.get(event.account)
+        # One row per month: each account's balance, then the total
+        self.names = list(accounts)
+        self._acct_index = {name: i for i, name in enumerate(self.names)}
+        self.history_arr = np.empty((months, len(self.names) + 1), dtype=np.float64)
+
+    @property
+    def history(self) -> List[Dict[str, float]]:
+        # Snapshot dicts are only built from history_arr when asked for
+        keys = ("Month", *self.names, "Total")
+        return [
+            dict(zip(keys, (month, *row)))
+            for month, row in enumerate(self.history_arr.tolist(), start=1)
+        ]
+
+    @property
+    def records(self):
+        # The history table as a structured array with named columns, built
+        # from history_arr in one bulk conversion
+        clashes = set(self.names) & set(RESERVED_NAMES)
+        if clashes:
+            raise ValueError(f"Account names clash with history columns: {sorted(clashes)}")
+
+        table = np.empty((self.months, len(self.names) + 2), dtype=np.float64)
+        table[:, 0] = np.arange(1, self.months + 1)
+        table[:, 1:] = self.history_arr
+
+        dtype = [("Month", "i4"), *((name, "f8") for name in self.names), ("Total", "f8")]
+        return rfn.unstructured_to_structured(table, dtype=np.dtype(dtype))
+
+    def _prepare(self):
+        # Lay balances / growth factors out as arrays in account order
+        n = len(self.names)
+        self.balances = np.fromiter(
+            (a.balance for a in self.accounts.values()), dtype=np.float64, count=n
+        )
+        self.factors = np.fromiter(
+            (a._monthly_factor for a in self.accounts.values()), dtype=np.float64, count=n
+        )
 
-                    if not acc:
-                        continue  # silently skip invalid accounts
+    def _pack_events(self):
+        # Resolve each event's account to its column index once, skipping
+        # invalid accounts, unknown types and months outside the range
+        acct_index = self._acct_index
+        resolved = []
+        for e in self.events:
+            a = acct_index.get(e.account)
+            if a is not None and e.op >= 0 and 1 <= e.month <= self.months:
+                resolved.append((e, a))
+
+        # Sort once by month (stable, so same-month events keep their order)
+        # and let the kernel walk them with a pointer
+        resolved.sort(key=lambda pair: pair[0].month)
+        n = len(resolved)
+
+        event_months = np.fromiter((e.month for e, _ in resolved), dtype=np.int64, count=n)
+        event_kinds = np.fromiter((e.op for e, _ in resolved), dtype=np.int8, count=n)
+        event_accts = np.fromiter((a for _, a in resolved), dtype=np.int32, count=n)
+        event_vals = np.fromiter(
+            (e.new_apy if e.op == APY_CHANGE else e.amount for e, _ in resolved),
+            dtype=np.float64,
+            count=n
+        )
 
-                    if event.type == "deposit":
-                        acc.deposit(event.amount)
+        # Turn every new APY into its monthly growth factor up front. This uses
+        # the scalar pow, since NumPy's array pow can be an ulp off from it.
+        apy = event_kinds == APY_CHANGE
+        event_vals[apy] = [(1 + v) ** (1 / 12) for v in event_vals[apy].tolist()]
 
-                    elif event.type == "expense":
-                        acc.withdraw(event.amount)
+        return event_months, event_kinds, event_accts, event_vals
 
-                    elif event.type == "apy_change":
-                        acc.annual_return = event.new_apy
+    def run(self):
+        self._prepare()
 
-            # 🔹 Apply monthly growth
-            for acc in self.accounts.values():
-                acc.apply_growth()
+        _simulate(self.balances, self.factors, *self._pack_events(), self.history_arr)
 
-            snapshot = {"Month": month}
-            for name, acc in self.accounts.items():
-                snapshot[name] = round(acc.balance, 2)
-            snapshot["Total"] = round(sum(a.balance for a in self.accounts.values()), 2)
+        # Totals for every month in one vectorized reduction
+        self.history_arr[:, :-1].sum(axis=1, out=self.history_arr[:, -1])
 
-            self.history.append(snapshot)
+        # Rounding is a display concern, so it happens once for the whole table
+        _round_cents(self.history_arr)
 
         return self.history
 
@@ -87,6 +197,8 @@ class FinanceApp(tk.Tk):
         self.geometry("700x500")
         self.events: List[Event] = []
         self.accounts: Dict[str, Account] = {}
+        # Reverse index so account edits only touch that account's events
+        self._events_by_account: Dict[str, List[Event]] = {}
         self.create_widgets()
 
     def create_widgets(self):
@@ -141,7 +253,7 @@ class FinanceApp(tk.Tk):
         self.event_month_entry = ttk.Entry(frame, width=10)
         self.event_type_combo = ttk.Combobox(
             frame,
-            values=["deposit", "expense", "apy_change"],
+            values=EVENT_TYPES,
             state="readonly",
             width=12
         )
@@ -177,12 +289,16 @@ class FinanceApp(tk.Tk):
             name = self.name_entry.get().strip()
             if not name:
                 raise ValueError("Account name required")
+            if name in RESERVED_NAMES:
+                raise ValueError(f"'{name}' is reserved for a history column")
 
             balance = float(self.balance_entry.get())
             annual_return = float(self.return_entry.get())
 
+            is_new = name not in self.accounts
             self.accounts[name] = Account(name, balance, annual_return)
-            self.refresh_account_list()
+            if is_new:
+                self.account_listbox.insert(self._account_position(name), name)
 
             messagebox.showinfo("Success", f"Added account: {name}")
 
@@ -219,6 +335,10 @@ class FinanceApp(tk.Tk):
         old_name = self.account_listbox.get(selection[0])
         new_name = self.name_entry.get().strip()
 
+        if new_name in RESERVED_NAMES:
+            messagebox.showerror("Error", f"'{new_name}' is reserved for a history column")
+            return
+
         try:
             balance = float(self.balance_entry.get())
             annual_return = float(self.return_entry.get())
@@ -228,19 +348,25 @@ class FinanceApp(tk.Tk):
 
         # Rename safely
         if new_name != old_name:
+            replaced = new_name in self.accounts
             self.accounts[new_name] = self.accounts.pop(old_name)
             self.accounts[new_name].name = new_name
 
+            self.account_listbox.delete(selection[0])
+            if not replaced:
+                self.account_listbox.insert(self._account_position(new_name), new_name)
+
             # Update events that reference this account
-            for e in self.events:
-                if e.account == old_name:
-                    e.account = new_name
+            bucket = self._events_by_account.pop(old_name, [])
+            for e in bucket:
+                e.account = new_name
+            if bucket:
+                self._events_by_account.setdefault(new_name, []).extend(bucket)
+                self.refresh_event_list()
 
         self.accounts[new_name].balance = balance
-        self.accounts[new_name].annual_return = annual_return
+        self.accounts[new_name].set_apy(annual_return)
 
-        self.refresh_account_list()
-        self.refresh_event_list()
         messagebox.showinfo("Updated", f"Account '{new_name}' updated")
 
     def remove_account(self):
@@ -255,15 +381,23 @@ class FinanceApp(tk.Tk):
             return
 
         del self.accounts[name]
-        self.events = [e for e in self.events if e.account != name]
+        self.account_listbox.delete(selection[0])
 
-        self.refresh_account_list()
-        self.refresh_event_list()
+        # Only rebuild the event list if the account actually had events
+        if self._events_by_account.pop(name, None):
+            self.events = [e for e in self.events if e.account != name]
+            self.refresh_event_list()
+
+    def _unindex_event(self, event):
+        bucket = self._events_by_account[event.account]
+        for i, e in enumerate(bucket):
+            if e is event:
+                del bucket[i]
+                break
 
-    def refresh_account_list(self):
-        self.account_listbox.delete(0, tk.END)
-        for name in sorted(self.accounts):
-            self.account_listbox.insert(tk.END, name)
+    def _account_position(self, name):
+        # The account list is kept sorted by name, so binary-search its rows
+        return bisect_left(self.account_listbox.get(0, tk.END), name)
 
     def add_event(self):
         try:
@@ -282,7 +416,8 @@ class FinanceApp(tk.Tk):
                 event = Event(month, event_type, account, amount=amount)
 
             self.events.append(event)
-            self.refresh_event_list()
+            self._events_by_account.setdefault(account, []).append(event)
+            self.event_listbox.insert(tk.END, self._format_event(event))
 
             messagebox.showinfo("Success", f"Event added for month {month}")
 
@@ -293,16 +428,17 @@ class FinanceApp(tk.Tk):
         except ValueError as e:
             messagebox.showerror("Error", str(e))
 
+    def _format_event(self, e):
+        if e.type == "apy_change":
+            return f"Month {e.month}: APY → {e.new_apy} ({e.account})"
+        return f"Month {e.month}: {e.type} {e.amount} ({e.account})"
+
     def refresh_event_list(self):
+        # Full rebuild, only needed when many events change at once
         self.event_listbox.delete(0, tk.END)
 
         for e in self.events:
-            if e.type == "apy_change":
-                label = f"Month {e.month}: APY → {e.new_apy} ({e.account})"
-            else:
-                label = f"Month {e.month}: {e.type} {e.amount} ({e.account})"
-
-            self.event_listbox.insert(tk.END, label)
+            self.event_listbox.insert(tk.END, self._format_event(e))
 
     def load_event_for_edit(self, event):
         selection = self.event_listbox.curselection()
@@ -331,26 +467,38 @@ class FinanceApp(tk.Tk):
             messagebox.showerror("Error", "Select an event to edit")
             return
 
-        try:
-            idx = selection[0]
-            e = self.events[idx]
-
-            e.month = int(self.event_month_entry.get())
-            e.account = self.event_account_entry.get()
-            e.type = self.event_type_combo.get()
-
-            if e.type == "apy_change":
-                e.new_apy = float(self.event_value_entry.get())
-                e.amount = 0.0
-            else:
-                e.amount = float(self.event_value_entry.get())
-                e.new_apy = 0.0
+        idx = selection[0]
+        e = self.events[idx]
 
+        # Parse every input before touching the event, so a rejected edit
+        # leaves both the event and its row as they were
+        try:
+            month = int(self.event_month_entry.get())
+            account = self.event_account_entry.get()
+            event_type = self.event_type_combo.get()
+            value = float(self.event_value_entry.get())
         except ValueError:
             messagebox.showerror("Error", "Invalid event values")
             return
 
-        self.refresh_event_list()
+        e.month = month
+        if account != e.account:
+            self._unindex_event(e)
+            self._events_by_account.setdefault(account, []).append(e)
+            e.account = account
+
+        e.type = event_type
+        e.op = EVENT_OP.get(event_type, -1)
+
+        if event_type == "apy_change":
+            e.new_apy = value
+            e.amount = 0.0
+        else:
+            e.amount = value
+            e.new_apy = 0.0
+
+        self.event_listbox.delete(idx)
+        self.event_listbox.insert(idx, self._format_event(e))
         messagebox.showinfo("Updated", "Event updated")
 
     def remove_event(self):
@@ -359,26 +507,27 @@ class FinanceApp(tk.Tk):
             messagebox.showerror("Error", "Select an event to remove")
             return
 
-        del self.events[selection[0]]
-        self.refresh_event_list()
+        self._unindex_event(self.events.pop(selection[0]))
+        self.event_listbox.delete(selection[0])
 
     def run_simulation(self):
         try:
             months = int(self.months_entry.get())
 
-            # 🔐 Deep copy accounts so we don't mutate originals
-            accounts_copy = {
-                name: Account(acc.name, acc.balance, acc.annual_return)
-                for name, acc in self.accounts.items()
-            }
-
-            sim = FinancialSimulation(accounts_copy, months, self.events)
+            # The simulation copies balances into its own arrays, so the
+            # originals are never mutated and no Account clones are needed
+            sim = FinancialSimulation(self.accounts, months, self.events)
 
-            history = sim.run()
+            sim.run()
+            records = sim.records
 
+            # Print from the record array, one insert for the whole table
+            # instead of one Tk call per month
+            keys = records.dtype.names
             self.output.delete("1.0", tk.END)
-            for row in history:
-                self.output.insert(tk.END, f"{row}\n")
+            self.output.insert(
+                "1.0", "\n".join(str(dict(zip(keys, row))) for row in records.tolist())
+            )
 
         except ValueError:
             messagebox.showerror("Error", "Invalid months")
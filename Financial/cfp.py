@@ -1,22 +1,32 @@
-from dataclasses import dataclass
-from typing import Dict, Callable, List
+import numpy as np
+from dataclasses import dataclass, field
+from operator import attrgetter
+from typing import Dict, Callable, List, Optional, Set, Tuple
 
 
 # -----------------------------
 # Account Definition
 # -----------------------------
 
-@dataclass
+@dataclass(slots=True)
 class Account:
     name: str
     balance: float
     annual_return: float
+    _growth: float = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        self._growth = (1 + self.annual_return) ** (1 / 12)
+
+    def set_apy(self, annual_return: float):
+        self.annual_return = annual_return
+        self._growth = (1 + annual_return) ** (1 / 12)
 
     def monthly_return(self) -> float:
-        return (1 + self.annual_return) ** (1 / 12) - 1
+        return self._growth - 1
 
     def apply_growth(self):
-        self.balance *= (1 + self.monthly_return())
+        self.balance *= self._growth
 
     def deposit(self, amount: float):
         self.balance += amount
@@ -29,11 +39,52 @@ class Account:
 # Event Definition
 # -----------------------------
 
-@dataclass
+# Integer codes the engine dispatches on; CUSTOM means "call event.action"
+CUSTOM, DEPOSIT, WITHDRAW, APY_CHANGE = -1, 0, 1, 2
+EVENT_KINDS = {"deposit": DEPOSIT, "withdraw": WITHDRAW, "apy_change": APY_CHANGE}
+
+
+@dataclass(slots=True)
 class Event:
     month: int
     action: Callable[[Dict[str, Account]], None]
     description: str = ""
+    # Set by the constructors below so the engine can skip calling `action`
+    kind: str = ""  # "deposit", "withdraw" or "apy_change"
+    account: str = ""
+    value: float = 0.0
+
+    @classmethod
+    def deposit(cls, month: int, account: str, amount: float, description: str = ""):
+        return cls(month, lambda accs: accs[account].deposit(amount), description,
+                   "deposit", account, amount)
+
+    @classmethod
+    def withdraw(cls, month: int, account: str, amount: float, description: str = ""):
+        return cls(month, lambda accs: accs[account].withdraw(amount), description,
+                   "withdraw", account, amount)
+
+    @classmethod
+    def apy_change(cls, month: int, account: str, new_rate: float, description: str = ""):
+        return cls(month, lambda accs: accs[account].set_apy(new_rate),
+                   description, "apy_change", account, new_rate)
+
+    def pack(self, index: Dict[str, int]) -> Tuple[int, int, float]:
+        # Translate into (kind code, account index, value) for the engine
+        kind = EVENT_KINDS.get(self.kind, CUSTOM)
+        if kind == CUSTOM:
+            return CUSTOM, -1, 0.0
+        return kind, index[self.account], float(self.value)
+
+
+def _to_cents(table):
+    # np.rint on the scaled table can tip a value sitting on a half cent the
+    # other way from round(x, 2); those few cells use round() instead
+    scaled = table * 100
+    near_tie = np.abs(scaled - np.floor(scaled) - 0.5) <= 4 * np.spacing(np.abs(scaled))
+    cents = np.rint(scaled).astype(np.int64)
+    cents[near_tie] = [round(round(v, 2) * 100) for v in table[near_tie].tolist()]
+    return cents
 
 
 # -----------------------------
@@ -41,34 +92,170 @@ class Event:
 # -----------------------------
 
 class FinancialSimulation:
-    def __init__(self, accounts: Dict[str, Account], months: int):
+    def __init__(
+        self,
+        accounts: Dict[str, Account],
+        months: int,
+        snapshot_every: int = 1,
+        snapshot_months: Optional[Set[int]] = None
+    ):
         self.accounts = accounts
         self.months = months
+        self.snapshot_every = snapshot_every  # record every Nth month only
+        self.snapshot_months = snapshot_months or set()  # ...plus these specific months
         self.events: List[Event] = []
-        self.history: List[Dict[str, float]] = []
+
+        # One row per snapshot month in whole cents: each account's balance, then the total
+        self._names = list(accounts)
+        self._row_months: List[int] = []
+        self.history_array = np.empty((0, len(self._names) + 1), dtype=np.int64)
+
+    @property
+    def history(self) -> List[Dict[str, float]]:
+        # Snapshot dicts are only built from history_array when asked for,
+        # and that is the only place cents turn back into dollars
+        keys = ("Month", *self._names, "Total")
+        dollars = (self.history_array / 100).tolist()
+        return [
+            dict(zip(keys, (month, *row)))
+            for month, row in zip(self._row_months, dollars)
+        ]
 
     def add_event(self, event: Event):
         self.events.append(event)
 
+    def _compile(self):
+        # Freeze account order and lay the accounts out as parallel arrays
+        self._names = list(self.accounts)
+        self._index = {name: i for i, name in enumerate(self._names)}
+        self._bal = np.array([a.balance for a in self.accounts.values()], dtype=np.float64)
+        self._apy = np.array([a.annual_return for a in self.accounts.values()], dtype=np.float64)
+        # Each account's cached scalar factor; NumPy's array pow can land an
+        # ulp away from Python's and drift results by a cent
+        self._growth = np.array([a._growth for a in self.accounts.values()], dtype=np.float64)
+
+        # Pack in-range events once into parallel arrays sorted by month
+        # (stable, so same-month events keep their order)
+        events = sorted(
+            (e for e in self.events if 1 <= e.month <= self.months),
+            key=attrgetter("month")
+        )
+        packed = [e.pack(self._index) for e in events]
+        self._events = events
+        self._event_month = np.array([e.month for e in events], dtype=np.int64)
+        self._event_kind = np.array([p[0] for p in packed], dtype=np.int8)
+        self._event_acct = np.array([p[1] for p in packed], dtype=np.int64)
+        self._event_val = np.array([p[2] for p in packed], dtype=np.float64)
+
+        # Withdrawals become negative amounts so all cash moves are one signed add
+        self._event_val[self._event_kind == WITHDRAW] *= -1
+
+        # month_starts[m]:month_starts[m + 1] slices out month m's events
+        self._month_starts = np.searchsorted(self._event_month, np.arange(self.months + 2))
+
+    def _store(self):
+        # Copy array state back onto the Account objects
+        for i, account in enumerate(self.accounts.values()):
+            account.balance = float(self._bal[i])
+            account.annual_return = float(self._apy[i])
+            account._growth = float(self._growth[i])
+
+    def _load(self):
+        # Pick up whatever a custom event action changed on the Account objects
+        for i, account in enumerate(self.accounts.values()):
+            self._bal[i] = account.balance
+            self._apy[i] = account.annual_return
+            self._growth[i] = (1 + account.annual_return) ** (1 / 12)
+
+    def _apply(self, kind: int, i: int, value: float, event: Event):
+        if kind == APY_CHANGE:
+            self._apy[i] = value
+            self._growth[i] = (1 + float(value)) ** (1 / 12)
+        elif kind == CUSTOM:
+            # Arbitrary action: run it against up-to-date Account objects
+            self._store()
+            event.action(self.accounts)
+            self._load()
+        else:
+            self._bal[i] += value  # deposit or (negative) withdrawal
+
+    def _apply_month(self, lo: int, hi: int):
+        kinds = self._event_kind[lo:hi]
+        accts = self._event_acct[lo:hi]
+        vals = self._event_val[lo:hi]
+
+        if (kinds == CUSTOM).any():
+            # Custom actions see the Account objects, so keep strict event order
+            for j in range(lo, hi):
+                self._apply(self._event_kind[j], self._event_acct[j], self._event_val[j],
+                            self._events[j])
+            return
+
+        # All deposits and withdrawals in one call; add.at applies repeated
+        # accounts in event order, exactly like one-at-a-time updates
+        cash = kinds != APY_CHANGE
+        np.add.at(self._bal, accts[cash], vals[cash])
+
+        # Rate changes are rare; apply them in order so the last one wins
+        for j in np.flatnonzero(~cash):
+            self._apply(APY_CHANGE, accts[j], vals[j], self._events[lo + j])
+
+    def _advance(self, k: int):
+        # Jump k months with no events in closed form
+        self._bal *= self._growth ** k
+
     def run(self):
-        for month in range(1, self.months + 1):
+        self._compile()
+        bal = self._bal
+        growth = self._growth
+        month_starts = self._month_starts
+        apply_month = self._apply_month
+        advance = self._advance
+        n = len(self._names)
+        row_months = sorted(
+            set(range(self.snapshot_every, self.months + 1, self.snapshot_every))
+            | {m for m in self.snapshot_months if 1 <= m <= self.months}
+        )
+        history = np.empty((len(row_months), n + 1), dtype=np.float64)
+        self._row_months = row_months
+
+        # Only months with events or a snapshot are stepped one at a time;
+        # the quiet stretches in between are jumped over in closed form
+        stops = sorted(
+            set(self._event_month.tolist())
+            | set(row_months)
+        )
+
+        month = 0
+        snap = 0
+        for stop in stops:
+            if stop - month > 1:
+                advance(stop - month - 1)
+            month = stop
 
             # Apply events
-            for event in self.events:
-                if event.month == month:
-                    event.action(self.accounts)
+            lo, hi = month_starts[month], month_starts[month + 1]
+            if lo < hi:
+                apply_month(lo, hi)
 
             # Apply growth
-            for account in self.accounts.values():
-                account.apply_growth()
+            bal *= growth
 
             # Snapshot
-            snapshot = {"Month": month}
-            for name, acc in self.accounts.items():
-                snapshot[name] = round(acc.balance, 2)
-            snapshot["Total"] = round(sum(a.balance for a in self.accounts.values()), 2)
+            if snap < len(row_months) and row_months[snap] == month:
+                history[snap, :n] = bal
+                snap += 1
+
+        if self.months > month:
+            advance(self.months - month)
+
+        self._store()
 
-            self.history.append(snapshot)
+        # Totals for every snapshot in one vectorized reduction
+        history[:, :n].sum(axis=1, out=history[:, n])
+
+        # Store the table as whole cents, rounded once rather than per cell
+        self.history_array = _to_cents(history)
 
         return self.history
 
@@ -115,9 +302,10 @@ if __name__ == "__main__":
         amount = get_float(f"Monthly contribution to {name} (0 if none): ")
         if amount > 0:
             for m in range(1, months + 1):
-                sim.add_event(Event(
+                sim.add_event(Event.deposit(
                     month=m,
-                    action=lambda accs, n=name, a=amount: accs[n].deposit(a),
+                    account=name,
+                    amount=amount,
                     description=f"Monthly contribution to {name}"
                 ))
 
@@ -130,9 +318,10 @@ if __name__ == "__main__":
         exp_amount = get_float("Expense amount: ")
         exp_account = input("Which account should it come from? ")
 
-        sim.add_event(Event(
+        sim.add_event(Event.withdraw(
             month=exp_month,
-            action=lambda accs, n=exp_account, a=exp_amount: accs[n].withdraw(a),
+            account=exp_account,
+            amount=exp_amount,
             description="Predictable expense"
         ))
 
@@ -147,9 +336,10 @@ if __name__ == "__main__":
         acct = input("Account name: ")
         new_rate = get_float("New annual return/APY: ")
 
-        sim.add_event(Event(
+        sim.add_event(Event.apy_change(
             month=change_month,
-            action=lambda accs, n=acct, r=new_rate: setattr(accs[n], "annual_return", r),
+            account=acct,
+            new_rate=new_rate,
             description="Return change"
         ))
 
@@ -159,10 +349,13 @@ if __name__ == "__main__":
     print("\n=== Output Preference ===")
     output_mode = input("Output monthly or yearly? (m/y): ").lower()
 
+    # Only record the months that will be printed
+    if output_mode != "m":
+        sim.snapshot_every = 12
+
     # ---- Run ----
     history = sim.run()
 
     print("\n=== Simulation Results ===\n")
     for row in history:
-        if output_mode == "m" or row["Month"] % 12 == 0:
-            print(row)
+        print(row)
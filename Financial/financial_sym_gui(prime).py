@@ -1,7 +1,8 @@
-import copy
 import tkinter as tk
 from tkinter import ttk, messagebox
 from dataclasses import dataclass
+from functools import lru_cache
+from operator import attrgetter
 from typing import Dict, List, Callable
 
 
@@ -9,21 +10,30 @@ from typing import Dict, List, Callable
 # Core Logic (Same as Before)
 # -----------------------------
 
-@dataclass
+EVENT_TYPES = ("deposit", "expense", "apy_change")
+
+
+@lru_cache(maxsize=256)
+def _monthly_factor(apy):
+    # The same few APYs come up month after month and run after run
+    return (1 + apy) ** (1 / 12)
+
+
+@dataclass(slots=True)
 class Event:
     month: int
     type: str
     account: str
     amount: float = 0.0
     new_apy: float = 0.0
-@dataclass
+@dataclass(slots=True)
 class Account:
     name: str
     balance: float
     annual_return: float
 
     def monthly_return(self):
-        return (1 + self.annual_return) ** (1 / 12) - 1
+        return _monthly_factor(self.annual_return) - 1
 
     def apply_growth(self):
         self.balance *= (1 + self.monthly_return())
@@ -43,35 +53,47 @@ class FinancialSimulation:
         self.history = []
 
     def run(self):
+        # Hoist everything the month loop touches into locals
+        keys = ("Month", *self.accounts, "Total")  # snapshot keys never change during a run
+        accounts = list(self.accounts.values())
+        get_account = self.accounts.get
+        history_append = self.history.append
+
+        # Sort once by month (stable, so same-month events keep their order)
+        # and walk the events with a pointer instead of rescanning them monthly
+        events = sorted(self.events, key=attrgetter("month"))
+        n_events = len(events)
+        i = 0
+        while i < n_events and events[i].month < 1:
+            i += 1
+
         for month in range(1, self.months + 1):
 
             # 🔹 Apply events scheduled for this month
-            for event in self.events:
-                if event.month == month:
-                    acc = self.accounts.get(event.account)
+            while i < n_events and events[i].month == month:
+                event = events[i]
+                i += 1
+                acc = get_account(event.account)
 
-                    if not acc:
-                        continue  # silently skip invalid accounts
+                if not acc:
+                    continue  # silently skip invalid accounts
 
-                    if event.type == "deposit":
-                        acc.deposit(event.amount)
+                if event.type == "deposit":
+                    acc.deposit(event.amount)
 
-                    elif event.type == "expense":
-                        acc.withdraw(event.amount)
+                elif event.type == "expense":
+                    acc.withdraw(event.amount)
 
-                    elif event.type == "apy_change":
-                        acc.annual_return = event.new_apy
+                elif event.type == "apy_change":
+                    acc.annual_return = event.new_apy
 
             # 🔹 Apply monthly growth
-            for acc in self.accounts.values():
+            for acc in accounts:
                 acc.apply_growth()
 
-            snapshot = {"Month": month}
-            for name, acc in self.accounts.items():
-                snapshot[name] = round(acc.balance, 2)
-            snapshot["Total"] = round(sum(a.balance for a in self.accounts.values()), 2)
-
-            self.history.append(snapshot)
+            balances = [acc.balance for acc in accounts]
+            values = (month, *(round(b, 2) for b in balances), round(sum(balances), 2))
+            history_append(dict(zip(keys, values)))
 
         return self.history
 
@@ -129,7 +151,7 @@ class FinanceApp(tk.Tk):
         self.event_month_entry = ttk.Entry(frame, width=10)
         self.event_type_combo = ttk.Combobox(
             frame,
-            values=["deposit", "expense", "apy_change"],
+            values=EVENT_TYPES,
             state="readonly",
             width=12
         )
@@ -208,7 +230,7 @@ class FinanceApp(tk.Tk):
             if not account:
                 raise ValueError("Account name required")
 
-            if event_type not in ["deposit", "expense", "apy_change"]:
+            if event_type not in EVENT_TYPES:
                 raise ValueError("Invalid event type")
 
             if event_type == "apy_change":
@@ -243,9 +265,9 @@ class FinanceApp(tk.Tk):
 
             history = sim.run()
 
+            # One insert for the whole table instead of one Tk call per month
             self.output.delete("1.0", tk.END)
-            for row in history:
-                self.output.insert(tk.END, f"{row}\n")
+            self.output.insert("1.0", "".join(f"{row}\n" for row in history))
 
         except ValueError:
             messagebox.showerror("Error", "Invalid months")
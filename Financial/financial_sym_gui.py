@@ -6,37 +6,60 @@
 # -----------------------------
 
 import tkinter as tk
+import numpy as np
+from bisect import bisect_left
 import matplotlib.pyplot as plt
 from tkinter import ttk, messagebox
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from enum import IntEnum
+from functools import lru_cache
 from typing import Dict, List
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 
+try:
+    from numba import njit
+except ImportError:  # Numba is optional; the kernel runs as plain Python without it
+    def njit(*args, **kwargs):
+        return lambda fn: fn
+
 
 # -----------------------------
 # Core Logic
 # -----------------------------
 
-@dataclass
+@lru_cache(maxsize=256)
+def _monthly_factor(apy):
+    # The same few APYs come up again every time the GUI re-runs or re-projects
+    return (1 + apy) ** (1 / 12)
+
+
+@dataclass(slots=True)
 class Event:
     month: int
     type: str
     account: str
     amount: float = 0.0
     new_apy: float = 0.0
-@dataclass
+@dataclass(slots=True)
 class Account:
     name: str
     balance: float
     annual_return: float
     monthly_contribution: float = 0.0
+    _growth: float = field(init=False, repr=False, compare=False)
 
+    def __post_init__(self):
+        self._growth = _monthly_factor(self.annual_return)
+
+    def set_apy(self, annual_return):
+        self.annual_return = annual_return
+        self._growth = _monthly_factor(annual_return)
 
     def monthly_return(self):
-        return (1 + self.annual_return) ** (1 / 12) - 1
+        return self._growth - 1
 
     def apply_growth(self):
-        self.balance *= (1 + self.monthly_return())
+        self.balance *= self._growth
 
     def deposit(self, amount):
         self.balance += amount
@@ -45,46 +68,165 @@ class Account:
         self.balance -= amount
 
 
+class EventKind(IntEnum):
+    # Integer event kinds used by the simulation kernel and projections
+    DEPOSIT = 0
+    EXPENSE = 1
+    APY_CHANGE = 2
+
+
+# Event.type strings (as shown in the GUI) to their kinds
+EVENT_KINDS = {kind.name.lower(): kind for kind in EventKind}
+EVENT_TYPES = tuple(EVENT_KINDS)
+
+
+@njit(cache=True)
+def _simulate(bal, growth, contrib, event_month, event_kind, event_acct, event_val, months, every):
+    n = bal.shape[0]
+    n_events = event_month.shape[0]
+    history = np.empty((months // every, n + 1))
+
+    i = 0
+    month = 0
+    snap = 0
+    while True:
+        # Next month that has events or needs a snapshot
+        stop = (month // every + 1) * every
+        if i < n_events and event_month[i] < stop:
+            stop = event_month[i]
+        if stop > months:
+            break
+
+        # Jump the quiet months before it in closed form: the balance
+        # compounds by g**k and the contributions (each made before that
+        # month's growth) form a geometric series g * (g**k - 1) / (g - 1)
+        k = stop - month - 1
+        if k > 0:
+            for j in range(n):
+                g = growth[j]
+                if g == 1.0:
+                    bal[j] += contrib[j] * k
+                else:
+                    g_k = g ** k
+                    bal[j] = bal[j] * g_k + contrib[j] * g * (g_k - 1.0) / (g - 1.0)
+        month = stop
+
+        # 🔹 Apply events scheduled for this month
+        while i < n_events and event_month[i] == month:
+            a = event_acct[i]
+            kind = event_kind[i]
+
+            if kind == EventKind.DEPOSIT:
+                bal[a] += event_val[i]
+            elif kind == EventKind.EXPENSE:
+                bal[a] -= event_val[i]
+            else:  # EventKind.APY_CHANGE
+                growth[a] = (1.0 + event_val[i]) ** (1.0 / 12.0)
+
+            i += 1
+
+        # 🔹 Apply monthly contributions and growth
+        bal += contrib
+        bal *= growth
+
+        if month % every == 0:
+            history[snap, :n] = bal
+            snap += 1
+
+    return history
+
+
+def _to_cents(table):
+    # np.rint on the scaled table can tip a value sitting on a half cent the
+    # other way from round(x, 2); those few cells use round() instead
+    scaled = table * 100
+    near_tie = np.abs(scaled - np.floor(scaled) - 0.5) <= 4 * np.spacing(np.abs(scaled))
+    cents = np.rint(scaled).astype(np.int64)
+    cents[near_tie] = [round(round(v, 2) * 100) for v in table[near_tie].tolist()]
+    return cents
+
+
 class FinancialSimulation:
-    def __init__(self, accounts: Dict[str, Account], months: int, events: List[Event]):
+    def __init__(
+        self,
+        accounts: Dict[str, Account],
+        months: int,
+        events: List[Event],
+        snapshot_every: int = 1
+    ):
         self.accounts = accounts
         self.months = months
         self.events = events
-        self.history = []
-
-    def run(self):
-        for month in range(1, self.months + 1):
-
-            # 🔹 Apply events scheduled for this month
-            for event in self.events:
-                if event.month == month:
-                    acc = self.accounts.get(event.account)
-
-                    if not acc:
-                        continue  # silently skip invalid accounts
-
-                    if event.type == "deposit":
-                        acc.deposit(event.amount)
-
-                    elif event.type == "expense":
-                        acc.withdraw(event.amount)
-
-                    elif event.type == "apy_change":
-                        acc.annual_return = event.new_apy
+        self.snapshot_every = snapshot_every  # record every Nth month only
+
+        # One row per snapshot month in whole cents: each account's balance, then the total
+        self._names = list(accounts)
+        self._snapshot_months = range(0)
+        self.history_array = np.empty((0, len(self._names) + 1), dtype=np.int64)
+
+    @property
+    def history(self) -> List[Dict[str, float]]:
+        # Snapshot dicts are only built from history_array when asked for,
+        # and that is the only place cents turn back into dollars
+        keys = ("Month", *self._names, "Total")
+        dollars = (self.history_array / 100).tolist()
+        return [
+            dict(zip(keys, (month, *row)))
+            for month, row in zip(self._snapshot_months, dollars)
+        ]
+
+    def _compile(self):
+        # Freeze account order and lay the accounts out as parallel arrays
+        accounts = self.accounts.values()
+        self._names = list(self.accounts)
+        self._index = {name: i for i, name in enumerate(self._names)}
+        self._bal = np.array([a.balance for a in accounts], dtype=np.float64)
+        self._growth = np.array([a._growth for a in accounts], dtype=np.float64)
+        # Only positive contributions are deposited; anything else is ignored
+        self._contrib = np.maximum(
+            np.array([a.monthly_contribution for a in accounts], dtype=np.float64), 0.0
+        )
 
-            # 🔹 Apply monthly growth
-            for acc in self.accounts.values():
-                if acc.monthly_contribution > 0:
-                    acc.deposit(acc.monthly_contribution)
+        # Bin events by month, then flatten the bins into month-sorted arrays
+        # for the kernel. Invalid accounts and unknown types are skipped.
+        events_by_month: List[List[Event]] = [[] for _ in range(self.months + 1)]
+        for event in self.events:
+            if (1 <= event.month <= self.months and event.account in self._index
+                    and event.type in EVENT_KINDS):
+                events_by_month[event.month].append(event)
+        events = [event for bucket in events_by_month for event in bucket]
+
+        self._event_month = np.array([e.month for e in events], dtype=np.int64)
+        self._event_kind = np.array([EVENT_KINDS[e.type] for e in events], dtype=np.int8)
+        self._event_acct = np.array([self._index[e.account] for e in events], dtype=np.int64)
+        self._event_val = np.array(
+            [e.new_apy if e.type == "apy_change" else e.amount for e in events],
+            dtype=np.float64
+        )
 
-                acc.apply_growth()
+    def run(self):
+        self._compile()
+        every = self.snapshot_every
+        self._snapshot_months = range(every, self.months + 1, every)
+
+        history = _simulate(
+            self._bal,
+            self._growth,
+            self._contrib,
+            self._event_month,
+            self._event_kind,
+            self._event_acct,
+            self._event_val,
+            self.months,
+            every
+        )
 
-            snapshot = {"Month": month}
-            for name, acc in self.accounts.items():
-                snapshot[name] = round(acc.balance, 2)
-            snapshot["Total"] = round(sum(a.balance for a in self.accounts.values()), 2)
+        # Totals for every snapshot in one vectorized reduction
+        n = len(self._names)
+        history[:, :n].sum(axis=1, out=history[:, n])
 
-            self.history.append(snapshot)
+        # Store the table as whole cents, rounded once rather than per cell
+        self.history_array = _to_cents(history)
 
         return self.history
 
@@ -101,6 +243,11 @@ class FinanceApp(tk.Tk):
         self.geometry("800x900")
         self.events: List[Event] = []
         self.accounts: Dict[str, Account] = {}
+
+        # Each account's projected balance after every month, rebuilt lazily
+        # after accounts or events change
+        self._projected: Dict[str, np.ndarray] = {}
+
         self.create_widgets()
 
     def create_widgets(self):
@@ -158,7 +305,7 @@ class FinanceApp(tk.Tk):
         self.event_month_entry = ttk.Entry(frame, width=10)
         self.event_type_combo = ttk.Combobox(
             frame,
-            values=["deposit", "expense", "apy_change"],
+            values=EVENT_TYPES,
             state="readonly",
             width=12
         )
@@ -204,14 +351,17 @@ class FinanceApp(tk.Tk):
             annual_return = float(self.return_entry.get())
             monthly_contribution = float(self.contribution_entry.get() or 0)
 
+            is_new = name not in self.accounts
             self.accounts[name] = Account(
                 name,
                 balance,
                 annual_return,
                 monthly_contribution
             )
+            self._events_changed()
 
-            self.refresh_account_list()
+            if is_new:
+                self.account_listbox.insert(self._account_position(name), name)
 
             messagebox.showinfo("Success", f"Added account: {name}")
 
@@ -260,19 +410,28 @@ class FinanceApp(tk.Tk):
 
         # Rename safely
         if new_name != old_name:
+            replaced = new_name in self.accounts
             self.accounts[new_name] = self.accounts.pop(old_name)
             self.accounts[new_name].name = new_name
 
-            # Update events that reference this account
+            self.account_listbox.delete(selection[0])
+            if not replaced:
+                self.account_listbox.insert(self._account_position(new_name), new_name)
+
+            # Update events that reference this account; their labels only
+            # need redrawing if there were any
+            renamed = False
             for e in self.events:
                 if e.account == old_name:
                     e.account = new_name
+                    renamed = True
+            if renamed:
+                self.refresh_event_list()
 
         self.accounts[new_name].balance = balance
-        self.accounts[new_name].annual_return = annual_return
+        self.accounts[new_name].set_apy(annual_return)
+        self._events_changed()
 
-        self.refresh_account_list()
-        self.refresh_event_list()
         messagebox.showinfo("Updated", f"Account '{new_name}' updated")
 
         self.accounts[new_name].monthly_contribution = float(
@@ -292,40 +451,77 @@ class FinanceApp(tk.Tk):
             return
 
         del self.accounts[name]
-        self.events = [e for e in self.events if e.account != name]
+        self._events_changed()
+        self.account_listbox.delete(selection[0])
 
-        self.refresh_account_list()
-        self.refresh_event_list()
+        # Only rebuild the event list if the account actually had events
+        kept = [e for e in self.events if e.account != name]
+        if len(kept) != len(self.events):
+            self.events = kept
+            self.refresh_event_list()
+
+    def _account_position(self, name):
+        # The account list is kept sorted by name, so binary-search its rows
+        return bisect_left(self.account_listbox.get(0, tk.END), name)
 
-    def refresh_account_list(self):
-        self.account_listbox.delete(0, tk.END)
-        for name in sorted(self.accounts):
-            self.account_listbox.insert(tk.END, name)
+    def _events_changed(self):
+        # Any change to accounts or events invalidates the projections
+        self._projected.clear()
 
     def get_projected_balance(self, account_name, target_month):
-        acc = self.accounts.get(account_name)
-        if not acc:
+        if account_name not in self.accounts:
             return 0.0
 
+        trajectory = self._projected.get(account_name)
+        if trajectory is None or target_month >= len(trajectory):
+            self._rebuild_projections(target_month)
+            trajectory = self._projected[account_name]
+
+        return round(float(trajectory[max(target_month, 0)]), 2)
+
+    def _rebuild_projections(self, horizon=0):
+        # Bucket every event by account and month in a single pass, resolving
+        # its kind once, then walk each account's months once, far enough to
+        # cover every event
+        horizon = max([horizon, 0, *(e.month for e in self.events)])
+
+        buckets: Dict[str, Dict[int, List[tuple]]] = {}
+        for e in self.events:
+            kind = EVENT_KINDS.get(e.type)
+            if kind is not None and e.month >= 1:
+                buckets.setdefault(e.account, {}).setdefault(e.month, []).append((kind, e))
+
+        self._projected = {
+            name: self._project_trajectory(acc, buckets.get(name, {}), horizon)
+            for name, acc in self.accounts.items()
+        }
+
+    @staticmethod
+    def _project_trajectory(acc, events_by_month, horizon):
+        # trajectory[m] is the balance after month m (trajectory[0] = today)
+        trajectory = np.empty(horizon + 1, dtype=np.float64)
+
         temp_balance = acc.balance
         temp_apy = acc.annual_return
+        growth = acc._growth
+        trajectory[0] = temp_balance
 
-        for month in range(1, target_month + 1):
+        for month in range(1, horizon + 1):
             temp_balance += acc.monthly_contribution
 
-            for e in self.events:
-                if e.month == month and e.account == account_name:
-                    if e.type == "deposit":
-                        temp_balance += e.amount
-                    elif e.type == "expense":
-                        temp_balance -= e.amount
-                    elif e.type == "apy_change":
-                        temp_apy = e.new_apy
+            for kind, e in events_by_month.get(month, ()):
+                if kind == EventKind.DEPOSIT:
+                    temp_balance += e.amount
+                elif kind == EventKind.EXPENSE:
+                    temp_balance -= e.amount
+                elif e.new_apy != temp_apy:  # EventKind.APY_CHANGE
+                    temp_apy = e.new_apy
+                    growth = _monthly_factor(temp_apy)
 
-            monthly_return = (1 + temp_apy) ** (1 / 12) - 1
-            temp_balance *= (1 + monthly_return)
+            temp_balance *= growth
+            trajectory[month] = temp_balance
 
-        return round(temp_balance, 2)
+        return trajectory
 
     def add_event(self):
         try:
@@ -339,7 +535,7 @@ class FinanceApp(tk.Tk):
                 raise ValueError(f"Month must be between 1 and {max_month}")
 
             event_type = self.event_type_combo.get()
-            if event_type not in ["deposit", "expense", "apy_change"]:
+            if event_type not in EVENT_KINDS:
                 raise ValueError("Invalid event type")
 
             account = self.event_account_entry.get().strip()
@@ -367,7 +563,8 @@ class FinanceApp(tk.Tk):
                 event = Event(month, event_type, account, amount=value)
 
             self.events.append(event)
-            self.refresh_event_list()
+            self._events_changed()
+            self.event_listbox.insert(tk.END, self._format_event(event))
 
             messagebox.showinfo("Success", f"Event added for month {month}")
 
@@ -378,16 +575,20 @@ class FinanceApp(tk.Tk):
         except ValueError as e:
             messagebox.showerror("Invalid Event", str(e))
 
+    def _format_event(self, e):
+        if e.type == "apy_change":
+            return f"Month {e.month}: APY → {e.new_apy} ({e.account})"
+        return f"Month {e.month}: {e.type} {e.amount} ({e.account})"
+
     def refresh_event_list(self):
+        # Full rebuild in one Tk call, only needed when many events change at once
         self.event_listbox.delete(0, tk.END)
+        self.event_listbox.insert(tk.END, *map(self._format_event, self.events))
 
-        for e in self.events:
-            if e.type == "apy_change":
-                label = f"Month {e.month}: APY → {e.new_apy} ({e.account})"
-            else:
-                label = f"Month {e.month}: {e.type} {e.amount} ({e.account})"
-
-            self.event_listbox.insert(tk.END, label)
+    def _redraw_event(self, idx):
+        # Replace a single row instead of rebuilding the whole list
+        self.event_listbox.delete(idx)
+        self.event_listbox.insert(idx, self._format_event(self.events[idx]))
 
     def load_event_for_edit(self, event):
         selection = self.event_listbox.curselection()
@@ -416,8 +617,9 @@ class FinanceApp(tk.Tk):
             messagebox.showerror("Error", "Select an event to edit")
             return
 
+        idx = selection[0]
+
         try:
-            idx = selection[0]
             e = self.events[idx]
 
             max_month = int(self.months_entry.get())
@@ -427,7 +629,7 @@ class FinanceApp(tk.Tk):
                 raise ValueError(f"Month must be between 1 and {max_month}")
 
             event_type = self.event_type_combo.get()
-            if event_type not in ["deposit", "expense", "apy_change"]:
+            if event_type not in EVENT_KINDS:
                 raise ValueError("Invalid event type")
 
             account = self.event_account_entry.get().strip()
@@ -439,6 +641,7 @@ class FinanceApp(tk.Tk):
             e.month = new_month
             e.account = account
             e.type = event_type
+            self._events_changed()
 
             if event_type == "apy_change":
                 if value < 0 or value > 1:
@@ -460,10 +663,14 @@ class FinanceApp(tk.Tk):
                 e.amount = value
                 e.new_apy = 0.0
 
-            self.refresh_event_list()
+            self._events_changed()
+            self._redraw_event(idx)
             messagebox.showinfo("Updated", "Event updated")
 
         except ValueError as e:
+            # A rejected edit may already have moved the event, so its row
+            # is redrawn here too
+            self._redraw_event(idx)
             messagebox.showerror("Invalid Event", str(e))
 
     def remove_event(self):
@@ -473,30 +680,22 @@ class FinanceApp(tk.Tk):
             return
 
         del self.events[selection[0]]
-        self.refresh_event_list()
+        self._events_changed()
+        self.event_listbox.delete(selection[0])
 
     def run_simulation(self):
         try:
             months = int(self.months_entry.get())
 
-            # Deep copy accounts so we don't mutate originals
-            accounts_copy = {
-                name: Account(
-                    acc.name,
-                    acc.balance,
-                    acc.annual_return,
-                    acc.monthly_contribution
-                )
-                for name, acc in self.accounts.items()
-            }
-
-            sim = FinancialSimulation(accounts_copy, months, self.events)
+            # The engine copies balances and rates into its own arrays and never
+            # writes back, so the accounts can be passed in without cloning
+            sim = FinancialSimulation(self.accounts, months, self.events)
 
             history = sim.run()
 
+            # One insert for the whole table instead of one Tk call per month
             self.output.delete("1.0", tk.END)
-            for row in history:
-                self.output.insert(tk.END, f"{row}\n")
+            self.output.insert("1.0", "\n".join(map(str, history)))
 
             self.render_chart(history)
 